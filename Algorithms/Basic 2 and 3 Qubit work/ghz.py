@@ -0,0 +1,253 @@
+# ===============================================================================
+# Shared GHZ Circuit and Simulation Helpers
+# Description: Code shared by both playground scripts, so it is defined in exactly
+#              one place: the 3-qubit GHZ (Greenberger–Horne–Zeilinger) circuit,
+#              cached OpenQASM 2 parsing, Aer simulator selection,
+#              exact and fast (simulator-free) GHZ counts, and histogram plotting.
+# ===============================================================================
+
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+# Importing this module does no work beyond the NumPy import: Qiskit and Aer are
+# imported, and circuits and simulators built, only when a function
+# first needs them, so utilities such as sample_ghz_counts stay cheap to import.
+
+# --- Simulator Selection ---
+# Instructions in the 'stabilizer' method's basis: Clifford gates plus
+# measurement, reset and barriers. Circuits are not transpiled before they are
+# run, so this must only list gates that method accepts as-is; other Clifford
+# gates (e.g. iswap, dcx) fall through to a statevector-based method.
+CLIFFORD_OPS = frozenset({
+    'id', 'x', 'y', 'z', 'h', 's', 'sdg', 'sx', 'sxdg',
+    'cx', 'cy', 'cz', 'swap', 'ecr',
+    'measure', 'reset', 'barrier',
+})
+
+
+# Options applied to every AerSimulator built here, whatever its method.
+SIMULATOR_OPTIONS = {
+    # Let Aer execute as many experiments of a batched run concurrently as its
+    # thread pool allows (Aer's default runs them one at a time).
+    'max_parallel_experiments': 0,
+}
+
+# Statevector circuits up to this many qubits get SMALL_STATEVECTOR_OPTIONS.
+SMALL_CIRCUIT_QUBITS = 5
+
+# Extra statevector options for the playground's few-qubit circuits only. Larger
+# circuits keep Aer's defaults (double precision, fusion from 14 qubits up to
+# 5-qubit fused gates), which are tuned for them.
+SMALL_STATEVECTOR_OPTIONS = {
+    # Single precision is ample at this size and halves the memory traffic.
+    'precision': 'single',
+    # Aer only fuses gates on circuits of 14+ qubits by default. Lowering the
+    # threshold lets small gate sequences such as H·CNOT·CNOT be folded into
+    # one unitary applied in a single pass over the amplitudes.
+    'fusion_enable': True,
+    'fusion_threshold': 1,
+    'fusion_max_qubit': 3,
+}
+
+
+@lru_cache(maxsize=None)
+def _make_simulator(method, small=False):
+    """Return the AerSimulator for ``method``, constructing it on first use.
+
+    Each configuration is built once and then reused by every run in the
+    process. ``small`` selects the few-qubit statevector tuning.
+    """
+    from qiskit_aer import AerSimulator
+
+    options = dict(SIMULATOR_OPTIONS)
+    if method == 'statevector' and small:
+        options.update(SMALL_STATEVECTOR_OPTIONS)
+    return AerSimulator(method=method, **options)
+
+
+def pick_simulator(circuit):
+    """Return a shared AerSimulator whose method suits ``circuit``.
+
+    Clifford-only circuits use the 'stabilizer' method, which runs in polynomial
+    time instead of tracking all 2^n amplitudes. Larger circuits (more than 20
+    qubits) use 'matrix_product_state', whose cost grows with entanglement
+    rather than exponentially with qubit count. Everything else uses
+    'statevector', in single precision with aggressive gate fusion when the
+    circuit has at most ``SMALL_CIRCUIT_QUBITS`` qubits.
+    """
+    if set(circuit.count_ops()) <= CLIFFORD_OPS:
+        return _make_simulator('stabilizer')
+    if circuit.num_qubits > 20:
+        return _make_simulator('matrix_product_state')
+    return _make_simulator('statevector', circuit.num_qubits <= SMALL_CIRCUIT_QUBITS)
+
+
+@lru_cache(maxsize=32)
+def compile_qasm(qasm):
+    """Parse an OpenQASM 2 program, caching the circuit per source string.
+
+    The playground circuits only use instructions native to AerSimulator, so the
+    parsed circuit is run as-is; callers must not modify the returned circuit.
+    """
+    from qiskit import qasm2
+
+    return qasm2.loads(qasm)
+
+
+# --- The GHZ Circuit as an OpenQASM 2 Program ---
+# A GHZ state requires at least 3 qubits.
+# The circuit has 3 qubits and 3 classical bits to store the measurement results.
+#
+# Hadamard gate on qubit 0 (h q[0]):
+# The Hadamard gate (H) transforms qubit 0 from its initial |0⟩ state
+# into a superposition of |0⟩ and |1⟩: ( |0⟩ + |1⟩ ) / sqrt(2).
+# This is the first step in creating the entangled state.
+#
+# CNOT gates for entanglement (cx q[0],q[1] and cx q[0],q[2]):
+# CNOT (Controlled-NOT) gates are used to create entanglement.
+# The CNOT gate flips the target qubit if the control qubit is |1⟩.
+# The first CNOT entangles Qubit 0 with Qubit 1, giving ( |00⟩ + |11⟩ ) / sqrt(2).
+# The second CNOT extends the entanglement to Qubit 2.
+# The final GHZ state becomes ( |000⟩ + |111⟩ ) / sqrt(2).
+# In this state, measuring any one qubit collapses the state of all three.
+#
+# Measurement of all qubits (measure q -> c):
+# Measure each quantum qubit and store its result in a corresponding classical bit.
+# This causes the "probabilistic collapse" of the multi-qubit superposition.
+# For an ideal GHZ state, we expect to predominantly see '000' or '111' as outcomes.
+# The barrier only documents that all measurements are terminal; Aer already
+# samples every shot from a single evolution for such circuits without it
+# (see uses_measure_sampling).
+GHZ_NUM_QUBITS = 3  # Size of the q and c registers below
+GHZ_QASM = """
+OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[3];
+creg c[3];
+h q[0];
+cx q[0],q[1];
+cx q[0],q[2];
+barrier q;
+measure q -> c;
+"""
+
+
+def ghz_circuit():
+    """Return the GHZ circuit, parsed from ``GHZ_QASM`` on the first call.
+
+    Parsing uses Qiskit's Rust-backed OpenQASM 2 parser and is cached by
+    ``compile_qasm``, so every run reuses the same circuit.
+    """
+    return compile_qasm(GHZ_QASM)
+
+
+# --- Results and Counts ---
+def uses_measure_sampling(result, index=0):
+    """Return whether Aer sampled experiment ``index`` of ``result`` from one evolution.
+
+    Reads the ``measure_sampling`` flag Aer records in each experiment's
+    metadata, so it costs nothing beyond the run that produced ``result``.
+    """
+    return bool(result.results[index].metadata.get('measure_sampling'))
+
+
+def _as_counts(outcomes, num_qubits):
+    """Return a counts dict from ``(outcome index, count)`` pairs.
+
+    Keys are ``num_qubits``-bit strings as in Qiskit's counts; outcomes with a
+    zero count are left out.
+    """
+    return {format(i, f'0{num_qubits}b'): int(c) for i, c in outcomes if c}
+
+
+def _round_to_shots(probs, shots):
+    """Scale ``probs`` to integer counts that sum exactly to ``shots``.
+
+    Counts are floored, then the shots lost to flooring go to the outcomes with
+    the largest remainders (largest-remainder rounding).
+    """
+    scaled = probs / probs.sum() * shots
+    counts = np.floor(scaled).astype(int)
+    remainder = shots - counts.sum()
+    counts[np.argsort(counts - scaled)[:remainder]] += 1
+    return counts
+
+
+def exact_counts(simulator, circuit, shots=1024):
+    """Return counts built from the exact output probabilities of ``circuit``.
+
+    For analysis-only runs, sampling ``shots`` measurements is wasted work: the
+    final measurements are dropped, the statevector is saved from a single
+    double-precision statevector-method run, and each outcome gets its
+    probability |amplitude|^2 scaled to ``shots``. Fractional counts are
+    rounded by largest remainder, so the counts always sum to ``shots``.
+
+    Only terminal measurements can be dropped this way. A circuit that still
+    measures mid-circuit has no single output statevector, so it raises
+    ``ValueError``; sample such circuits with ``simulator.run`` instead.
+    """
+    qc = circuit.remove_final_measurements(inplace=False)
+    if 'measure' in qc.count_ops():
+        raise ValueError(
+            "exact_counts only supports circuits whose measurements are all "
+            f"terminal; {circuit.name!r} measures mid-circuit"
+        )
+
+    from qiskit_aer.library import save_statevector
+
+    save_statevector(qc)
+    result = simulator.run(qc, shots=1, method='statevector', precision='double').result()
+    probs = np.abs(np.asarray(result.data(0)['statevector'])) ** 2
+    return _as_counts(enumerate(_round_to_shots(probs, shots)), qc.num_qubits)
+
+
+def sample_ghz_counts(num_qubits=3, shots=1024, seed=None):
+    """Draw GHZ measurement counts directly from the known output distribution.
+
+    An ideal n-qubit GHZ state measures as all-zeros or all-ones with
+    probability 1/2 each, so the all-zeros count is a single binomial draw and
+    no simulator is started. ``seed`` seeds a private ``np.random.Generator``;
+    NumPy's global random state is never touched.
+    """
+    zeros = int(np.random.default_rng(seed).binomial(shots, 0.5))
+    return _as_counts([(0, zeros), (2 ** num_qubits - 1, shots - zeros)], num_qubits)
+
+
+def run_ghz(simulator, shots=1024, exact=False, fast_path=False, seed=None):
+    """Simulate the GHZ circuit on ``simulator`` and return its measurement counts.
+
+    With ``exact=True`` the counts come from the exact statevector (see
+    ``exact_counts``) instead of ``shots`` sampled measurements. With
+    ``fast_path=True`` the simulator is skipped entirely and the counts are
+    drawn from the ideal GHZ distribution by ``sample_ghz_counts``, seeded with
+    ``seed``.
+    """
+    if fast_path:
+        return sample_ghz_counts(GHZ_NUM_QUBITS, shots, seed)
+    if exact:
+        return exact_counts(simulator, ghz_circuit(), shots)
+    return simulator.run(ghz_circuit(), shots=shots).result().get_counts(0)
+
+
+def plot_counts(counts, title, filename):
+    """Save a histogram of ``counts`` to ``filename`` as a PNG.
+
+    matplotlib is imported here rather than at module level, so runs that never
+    plot skip its import and font-cache setup. If matplotlib has not been loaded
+    yet and no MPLBACKEND is set, the non-interactive 'Agg' backend is selected,
+    which renders straight to the file without probing for a GUI; a backend the
+    caller already chose is left alone.
+    """
+    if 'matplotlib' not in sys.modules and 'MPLBACKEND' not in os.environ:
+        import matplotlib
+        matplotlib.use('Agg')  # Must be selected before pyplot is imported
+    import matplotlib.pyplot as plt
+    from qiskit.visualization import plot_histogram
+
+    # bbox_inches='tight' trims the figure so labels don't get cut off.
+    fig = plot_histogram(counts, title=title)
+    fig.savefig(filename, bbox_inches='tight', dpi=100)
+    plt.close(fig)  # Release the figure's memory
@@ -0,0 +1,170 @@
+# ===============================================================================
+# Tests for the Shared GHZ Helpers (ghz.py)
+# Description: Run with `python -m pytest` from this directory. Tests that need
+#              Qiskit, Aer or matplotlib are skipped when those packages are not installed.
+# ===============================================================================
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import ghz
+
+
+# --- Exact Counts ---
+def test_round_to_shots_sums_to_shots():
+    counts = ghz._round_to_shots(np.full(3, 1 / 3), 1024)
+    assert counts.sum() == 1024
+    assert sorted(counts) == [341, 341, 342]
+
+
+def test_round_to_shots_gives_leftover_shots_to_largest_remainders():
+    # Scaled to 10 shots: 1.5, 3.5, 5.0 -> floors 1, 3, 5 leave one shot, which
+    # goes to one of the two outcomes with a 0.5 remainder, never to the exact 5.
+    counts = ghz._round_to_shots(np.array([0.15, 0.35, 0.5]), 10)
+    assert counts.sum() == 10
+    assert counts[2] == 5
+
+
+def test_round_to_shots_keeps_exact_counts():
+    counts = ghz._round_to_shots(np.array([0.5, 0.0, 0.0, 0.5]), 1024)
+    assert list(counts) == [512, 0, 0, 512]
+
+
+def test_exact_counts_of_ghz():
+    pytest.importorskip('qiskit_aer')
+    circuit = ghz.ghz_circuit()
+    counts = ghz.exact_counts(ghz.pick_simulator(circuit), circuit, shots=1000)
+    assert counts == {'000': 500, '111': 500}
+
+
+def test_exact_counts_rejects_mid_circuit_measurements():
+    pytest.importorskip('qiskit_aer')
+    circuit = ghz.compile_qasm("""
+OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+h q[0];
+measure q[0] -> c[0];
+cx q[0],q[1];
+measure q -> c;
+""")
+    with pytest.raises(ValueError, match='mid-circuit'):
+        ghz.exact_counts(ghz.pick_simulator(circuit), circuit, shots=100)
+
+
+# --- Fast GHZ Sampling ---
+def test_sample_ghz_counts_is_reproducible_with_a_seed():
+    assert ghz.sample_ghz_counts(shots=1024, seed=7) == ghz.sample_ghz_counts(shots=1024, seed=7)
+
+
+def test_sample_ghz_counts_only_gives_all_zeros_or_all_ones():
+    counts = ghz.sample_ghz_counts(num_qubits=4, shots=500, seed=1)
+    assert set(counts) <= {'0000', '1111'}
+    assert sum(counts.values()) == 500
+
+
+def test_sample_ghz_counts_leaves_global_random_state_alone():
+    np.random.seed(0)
+    expected = np.random.random()
+    np.random.seed(0)
+    ghz.sample_ghz_counts(seed=3)
+    ghz.sample_ghz_counts()
+    assert np.random.random() == expected
+
+
+def test_run_ghz_fast_path_matches_sample_ghz_counts():
+    # The fast path never touches the simulator, so none is needed.
+    assert ghz.run_ghz(None, shots=256, fast_path=True, seed=5) == ghz.sample_ghz_counts(shots=256, seed=5)
+
+
+# --- Simulator Selection ---
+def _chain(num_qubits, gate='h'):
+    """Return a circuit applying ``gate`` to qubit 0 followed by a CNOT chain."""
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(num_qubits)
+    getattr(qc, gate)(0)
+    for i in range(num_qubits - 1):
+        qc.cx(i, i + 1)
+    qc.measure_all()
+    return qc
+
+
+def test_pick_simulator_uses_stabilizer_for_clifford_circuits():
+    pytest.importorskip('qiskit_aer')
+    assert ghz.pick_simulator(ghz.ghz_circuit()).options.method == 'stabilizer'
+    assert ghz.pick_simulator(_chain(30)).options.method == 'stabilizer'
+
+
+def test_pick_simulator_does_not_send_non_native_cliffords_to_stabilizer():
+    pytest.importorskip('qiskit_aer')
+    qc = _chain(2)
+    qc.iswap(0, 1)
+    assert ghz.pick_simulator(qc).options.method == 'statevector'
+
+
+def test_pick_simulator_tunes_small_statevector_circuits_only():
+    pytest.importorskip('qiskit_aer')
+    small = ghz.pick_simulator(_chain(ghz.SMALL_CIRCUIT_QUBITS, 't'))
+    assert small.options.method == 'statevector'
+    assert small.options.precision == 'single'
+    assert small.options.fusion_threshold == 1
+
+    large = ghz.pick_simulator(_chain(ghz.SMALL_CIRCUIT_QUBITS + 1, 't'))
+    assert large.options.method == 'statevector'
+    assert large.options.precision == 'double'
+    assert large.options.fusion_threshold != 1
+
+
+def test_pick_simulator_uses_matrix_product_state_above_20_qubits():
+    pytest.importorskip('qiskit_aer')
+    mps = ghz.pick_simulator(_chain(21, 't'))
+    assert mps.options.method == 'matrix_product_state'
+    assert mps.options.precision == 'double'
+
+
+def test_pick_simulator_reuses_simulators():
+    pytest.importorskip('qiskit_aer')
+    assert ghz.pick_simulator(_chain(3)) is ghz.pick_simulator(ghz.ghz_circuit())
+
+
+# --- Plotting ---
+# Each case runs in a fresh interpreter, because the guard depends on whether
+# matplotlib has already been imported.
+def _backend_after_plot(tmp_path, setup='', mplbackend=None):
+    """Run ``setup`` then ``plot_counts`` in a new process; return the backend."""
+    pytest.importorskip('matplotlib')
+    pytest.importorskip('qiskit')
+    env = {k: v for k, v in os.environ.items() if k != 'MPLBACKEND'}
+    if mplbackend:
+        env['MPLBACKEND'] = mplbackend
+    code = (
+        f"{setup}\n"
+        "import ghz, matplotlib\n"
+        f"ghz.plot_counts({{'00': 3, '11': 5}}, 'test', {str(tmp_path / 'plot.png')!r})\n"
+        "print(matplotlib.get_backend().lower())\n"
+    )
+    out = subprocess.run(
+        [sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True,
+    )
+    assert (tmp_path / 'plot.png').exists()
+    return out.stdout.split()[-1]
+
+
+def test_plot_counts_defaults_to_agg(tmp_path):
+    assert _backend_after_plot(tmp_path) == 'agg'
+
+
+def test_plot_counts_respects_mplbackend(tmp_path):
+    assert _backend_after_plot(tmp_path, mplbackend='pdf') == 'pdf'
+
+
+def test_plot_counts_keeps_an_already_chosen_backend(tmp_path):
+    setup = "import matplotlib; matplotlib.use('svg')"
+    assert _backend_after_plot(tmp_path, setup=setup) == 'svg'